@@ -1,65 +1,591 @@
+import asyncio
+import hashlib
+import os
+import sys
+import time
+import timeit
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from itertools import compress
+from typing import Callable, Hashable, Iterator
 
 
 # -----------------------------
 # Handler Interface
 # -----------------------------
 class Handler(ABC):
+    # Request keys this handler reads; used to build columns in handle_batch
+    fields: tuple[str, ...] = ()
+    # Pinned handlers keep their position when an AdaptiveChain reorders
+    pinned: bool = False
+
     def __init__(self, next_handler=None):
         self.next_handler = next_handler
 
-    @abstractmethod
     def handle(self, request: dict) -> None:
+        """Nested dispatch: each hop calls the next handler"""
+        if self.process(request) and self.next_handler:
+            self.next_handler.handle(request)
+
+    @abstractmethod
+    def process(self, request: dict) -> bool:
+        """Run this handler's own step. Return False to stop the chain."""
+        pass
+
+    def process_batch(self, columns: dict[str, list], requests: list[dict]) -> list[bool]:
+        """
+        Run this handler's step over a whole batch and return a keep-mask.
+        Handlers override this with a column-wise check; the default
+        falls back to calling process() per request.
+        """
+        return [self.process(request) for request in requests]
+
+    def handle_batch(self, requests: list[dict]) -> list[bool]:
+        """
+        Columnar dispatch: each handler checks the surviving batch once,
+        and only the requests it keeps move on to the next handler.
+        Returns, per request, whether it made it through the whole chain.
+        """
+        handlers = list(self.iter_chain())
+        fields = {field for handler in handlers for field in handler.fields}
+
+        index = list(range(len(requests)))
+        survivors = list(requests)
+        columns = {field: [request.get(field) for request in survivors] for field in fields}
+
+        for handler in handlers:
+            if not index:
+                break
+            mask = handler.process_batch(columns, survivors)
+            index = list(compress(index, mask))
+            survivors = list(compress(survivors, mask))
+            columns = {field: list(compress(column, mask)) for field, column in columns.items()}
+
+        outcomes = [False] * len(requests)
+        for position in index:
+            outcomes[position] = True
+        return outcomes
+
+    def iter_chain(self) -> Iterator["Handler"]:
+        handler = self
+        while handler is not None:
+            yield handler
+            handler = handler.next_handler
+
+    def compile(self) -> "CompiledChain":
+        """Flatten the chain starting at this handler into a single loop"""
+        return CompiledChain([handler.process for handler in self.iter_chain()])
+
+    def compile_adaptive(self, reorder_every: int = 1000, on_reorder=None) -> "AdaptiveChain":
+        """Flatten the chain into a loop that reorders its filters as it learns"""
+        return AdaptiveChain(list(self.iter_chain()), reorder_every, on_reorder)
+
+
+# -----------------------------
+# Compiled (flat) Chain
+# -----------------------------
+class CompiledChain:
+    """
+    Same short-circuit semantics as Handler.handle, but the steps run
+    in one loop, so a long chain costs no extra Python frames per hop
+    and never hits the recursion limit.
+    """
+
+    def __init__(self, steps: list[Callable[[dict], bool]]):
+        self._steps = tuple(steps)
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def handle(self, request: dict) -> bool:
+        """Return True if the request made it through every handler"""
+        for step in self._steps:
+            if not step(request):
+                return False
+        return True
+
+
+# -----------------------------
+# Adaptive Chain
+# -----------------------------
+class HandlerStats:
+    def __init__(self):
+        self.calls = 0
+        self.rejections = 0
+        self.cost_ns = 0
+
+    @property
+    def avg_cost_ns(self) -> float:
+        return self.cost_ns / self.calls if self.calls else 0.0
+
+    @property
+    def rejection_rate(self) -> float:
+        return self.rejections / self.calls if self.calls else 0.0
+
+    def decay(self) -> None:
+        """Halve the history so the chain keeps following the request mix"""
+        self.calls //= 2
+        self.rejections //= 2
+        self.cost_ns //= 2
+
+
+class AdaptiveChain:
+    """
+    Flat chain that records each handler's cost and rejection rate and,
+    every `reorder_every` requests, reorders the unpinned handlers
+    to minimize expected cost per request.
+
+    Unpinned handlers must be independent filters (order does not change
+    their answer). Pinned handlers, e.g. BusinessLogicHandler, stay where
+    they are and split the chain into segments that are sorted separately.
+    """
+
+    def __init__(self, handlers: list[Handler], reorder_every: int = 1000, on_reorder=None):
+        self._handlers = list(handlers)
+        self._stats = {id(handler): HandlerStats() for handler in self._handlers}
+        self._reorder_every = reorder_every
+        self._on_reorder = on_reorder or self._print_reorder
+        self.metrics = {"requests": 0, "reorders": 0}
+
+    @property
+    def order(self) -> list[str]:
+        return [type(handler).__name__ for handler in self._handlers]
+
+    def stats(self, handler: Handler) -> HandlerStats:
+        return self._stats[id(handler)]
+
+    def handle(self, request: dict) -> bool:
+        """Return True if the request made it through every handler"""
+        passed = True
+        for handler in self._handlers:
+            stats = self._stats[id(handler)]
+            start = time.perf_counter_ns()
+            ok = handler.process(request)
+            stats.cost_ns += time.perf_counter_ns() - start
+            stats.calls += 1
+            if not ok:
+                stats.rejections += 1
+                passed = False
+                break
+
+        self.metrics["requests"] += 1
+        if self.metrics["requests"] % self._reorder_every == 0:
+            self.reorder()
+        return passed
+
+    def expected_cost_ns(self, handlers: list[Handler] | None = None) -> float:
+        """Sum of each handler's cost weighted by the chance it is reached"""
+        expected = 0.0
+        reach = 1.0
+        for handler in handlers or self._handlers:
+            stats = self._stats[id(handler)]
+            expected += reach * stats.avg_cost_ns
+            reach *= 1.0 - stats.rejection_rate
+        return expected
+
+    def _rank(self, handler: Handler) -> float:
+        # Cheap filters that reject a lot go first: sort by cost / P(reject)
+        stats = self._stats[id(handler)]
+        if stats.rejection_rate == 0.0:
+            return float("inf")
+        return stats.avg_cost_ns / stats.rejection_rate
+
+    def reorder(self) -> None:
+        new_order: list[Handler] = []
+        segment: list[Handler] = []
+        for handler in self._handlers:
+            if handler.pinned:
+                new_order += sorted(segment, key=self._rank)
+                new_order.append(handler)
+                segment = []
+            else:
+                segment.append(handler)
+        new_order += sorted(segment, key=self._rank)
+
+        if new_order != self._handlers:
+            before = self.order
+            cost_before = self.expected_cost_ns()
+            cost_after = self.expected_cost_ns(new_order)
+            self._handlers = new_order
+            self.metrics["reorders"] += 1
+            self._on_reorder({
+                "before": before,
+                "after": self.order,
+                "expected_cost_ns_before": cost_before,
+                "expected_cost_ns_after": cost_after,
+                "reorders": self.metrics["reorders"],
+            })
+
+        for stats in self._stats.values():
+            stats.decay()
+
+    @staticmethod
+    def _print_reorder(event: dict) -> None:
+        print(
+            f"🔀 Reordered chain: {' → '.join(event['after'])} "
+            f"(expected {event['expected_cost_ns_before']:.0f} → "
+            f"{event['expected_cost_ns_after']:.0f} ns/request)"
+        )
+
+
+# -----------------------------
+# Async Handlers & Chain Runner
+# -----------------------------
+class AsyncHandler(ABC):
+    """Handler whose step is a coroutine, e.g. a call to an identity service"""
+
+    @abstractmethod
+    async def process(self, request: dict) -> bool:
         pass
 
 
+class Concurrent:
+    """Chain segment of independent handlers that may run at the same time"""
+
+    def __init__(self, *handlers: Handler | AsyncHandler):
+        self.handlers = handlers
+
+
+class AsyncChain:
+    """
+    Runs a chain of sync and async handlers in order. A Concurrent segment
+    starts all of its handlers at once; the first rejection cancels the
+    rest of the segment and stops the chain.
+    """
+
+    def __init__(self, *stages: Handler | AsyncHandler | Concurrent):
+        self._stages = stages
+
+    @classmethod
+    def from_chain(cls, head: Handler) -> "AsyncChain":
+        return cls(*head.iter_chain())
+
+    async def handle(self, request: dict) -> bool:
+        """Return True if the request made it through every handler"""
+        for stage in self._stages:
+            if isinstance(stage, Concurrent):
+                ok = await self._run_concurrent(stage.handlers, request)
+            else:
+                ok = await self._run(stage, request)
+            if not ok:
+                return False
+        return True
+
+    @staticmethod
+    async def _run(handler: Handler | AsyncHandler, request: dict) -> bool:
+        if isinstance(handler, AsyncHandler):
+            return await handler.process(request)
+        # Plain Handler subclasses are synchronous: run them inline
+        return handler.process(request)
+
+    async def _run_concurrent(self, handlers, request: dict) -> bool:
+        tasks = [asyncio.ensure_future(self._run(handler, request)) for handler in handlers]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                if not await next_done:
+                    return False
+            return True
+        finally:
+            for task in tasks:
+                task.cancel()
+
+
+# -----------------------------
+# Decision Cache
+# -----------------------------
+class DecisionCache:
+    """
+    Bounded LRU + TTL cache of handler decisions.
+
+    `key` projects a request onto what the decision depends on,
+    e.g. lambda r: (r.get("user"), r.get("authenticated")).
+    Requests whose key is None are never cached. Rejections are cached
+    for `negative_ttl` seconds (defaults to `ttl`; 0 disables it).
+    """
+
+    def __init__(
+        self,
+        key: Callable[[dict], Hashable],
+        maxsize: int = 10_000,
+        ttl: float = 60.0,
+        negative_ttl: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._key = key
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[bool, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def decide(self, request: dict, compute: Callable[[dict], bool]) -> bool:
+        key = self._key(request)
+        if key is None:
+            return compute(request)
+
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None:
+            decision, expires_at = entry
+            if expires_at > now:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return decision
+            del self._entries[key]
+            self.expirations += 1
+
+        self.misses += 1
+        decision = compute(request)
+        ttl = self._ttl if decision else self._negative_ttl
+        if ttl > 0:
+            self._entries[key] = (decision, now + ttl)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return decision
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CachedHandler(Handler):
+    """Takes the wrapped handler's place in the chain and caches its decisions"""
+
+    def __init__(self, handler: Handler, cache: DecisionCache):
+        super().__init__(handler.next_handler)
+        self.handler = handler
+        self.cache = cache
+        self.fields = handler.fields
+        self.pinned = handler.pinned
+
+    def process(self, request: dict) -> bool:
+        return self.cache.decide(request, self.handler.process)
+
+
 # -----------------------------
 # Concrete Handlers
 # -----------------------------
 class AuthenticationHandler(Handler):
-    def handle(self, request: dict) -> None:
+    fields = ("authenticated",)
+
+    def process(self, request: dict) -> bool:
         if not request.get("authenticated"):
             print("❌ Authentication failed")
-            return
+            return False
 
         print("✅ Authentication passed")
-        if self.next_handler:
-            self.next_handler.handle(request)
+        return True
+
+    def process_batch(self, columns: dict[str, list], requests: list[dict]) -> list[bool]:
+        mask = list(map(bool, columns["authenticated"]))
+        print(f"✅ Authentication passed {sum(mask)}/{len(mask)}")
+        return mask
 
 
 class AuthorizationHandler(Handler):
-    def handle(self, request: dict) -> None:
+    fields = ("is_admin",)
+
+    def process(self, request: dict) -> bool:
         if not request.get("is_admin"):
             print("❌ Authorization failed")
-            return
+            return False
 
         print("✅ Authorization passed")
-        if self.next_handler:
-            self.next_handler.handle(request)
+        return True
+
+    def process_batch(self, columns: dict[str, list], requests: list[dict]) -> list[bool]:
+        mask = list(map(bool, columns["is_admin"]))
+        print(f"✅ Authorization passed {sum(mask)}/{len(mask)}")
+        return mask
 
 
 class ValidationHandler(Handler):
-    def handle(self, request: dict) -> None:
+    fields = ("data",)
+
+    def process(self, request: dict) -> bool:
         if not request.get("data"):
             print("❌ Validation failed")
-            return
+            return False
 
         print("✅ Validation passed")
-        if self.next_handler:
-            self.next_handler.handle(request)
+        return True
+
+    def process_batch(self, columns: dict[str, list], requests: list[dict]) -> list[bool]:
+        mask = list(map(bool, columns["data"]))
+        print(f"✅ Validation passed {sum(mask)}/{len(mask)}")
+        return mask
 
 
 class BusinessLogicHandler(Handler):
-    def handle(self, request: dict) -> None:
+    pinned = True
+
+    def process(self, request: dict) -> bool:
         print("🎯 Business logic executed successfully")
+        return True
+
+    def process_batch(self, columns: dict[str, list], requests: list[dict]) -> list[bool]:
+        print(f"🎯 Business logic executed for {len(requests)} requests")
+        return [True] * len(requests)
+
+
+async def call_identity_service(latency: float) -> None:
+    """Stand-in for a network round trip to the identity service"""
+    await asyncio.sleep(latency)
+
+
+class AsyncAuthenticationHandler(AsyncHandler):
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+
+    async def process(self, request: dict) -> bool:
+        await call_identity_service(self.latency)
+        if not request.get("authenticated"):
+            print("❌ Authentication failed")
+            return False
+
+        print("✅ Authentication passed")
+        return True
+
+
+class AsyncAuthorizationHandler(AsyncHandler):
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+
+    async def process(self, request: dict) -> bool:
+        await call_identity_service(self.latency)
+        if not request.get("is_admin"):
+            print("❌ Authorization failed")
+            return False
+
+        print("✅ Authorization passed")
+        return True
+
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+class PassThroughHandler(Handler):
+    """Silent handler used to build long chains for benchmarking"""
+
+    def process(self, request: dict) -> bool:
+        return True
+
+
+class PasswordCheckHandler(Handler):
+    """Silent handler with a realistic per-request cost (password hashing)"""
+
+    def process(self, request: dict) -> bool:
+        digest = hashlib.pbkdf2_hmac("sha256", request["user"].encode(), b"salt", 200)
+        return digest[0] % 8 != 0
+
+
+def build_pass_through_chain(length: int) -> Handler:
+    head = None
+    for _ in range(length):
+        head = PassThroughHandler(head)
+    return head
+
+
+def benchmark_compiled_dispatch(lengths=(5, 50, 500), number: int = 2000) -> None:
+    print("\n--- Nested vs compiled dispatch ---")
+    request = {"authenticated": True, "is_admin": True, "data": "payload"}
+    for length in lengths:
+        chain = build_pass_through_chain(length)
+        compiled = chain.compile()
+        nested_s = timeit.timeit(lambda: chain.handle(request), number=number)
+        compiled_s = timeit.timeit(lambda: compiled.handle(request), number=number)
+        print(
+            f"{length:>4} handlers: nested {nested_s / number * 1e6:8.2f} µs/req, "
+            f"compiled {compiled_s / number * 1e6:8.2f} µs/req "
+            f"({nested_s / compiled_s:.2f}x)"
+        )
+
+
+def benchmark_batch_dispatch(size: int = 100_000) -> None:
+    print("\n--- Sequential vs batch dispatch ---")
+    chain = build_auth_chain()
+    requests = [
+        {"authenticated": i % 2 == 0, "is_admin": i % 3 == 0, "data": "payload" if i % 5 else ""}
+        for i in range(size)
+    ]
+    compiled = chain.compile()
+
+    # Handlers print on every decision; send that to devnull while timing
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        sequential_s = timeit.timeit(lambda: [compiled.handle(r) for r in requests], number=1)
+        batch_s = timeit.timeit(lambda: chain.handle_batch(requests), number=1)
+    print(
+        f"{size} requests: sequential {size / sequential_s:,.0f} req/s, "
+        f"batch {size / batch_s:,.0f} req/s ({sequential_s / batch_s:.2f}x)"
+    )
+
+
+def benchmark_adaptive_dispatch(size: int = 50_000) -> None:
+    print("\n--- Fixed vs adaptive order (validation rejects 90%) ---")
+    requests = [
+        {"authenticated": True, "is_admin": True, "data": "payload" if i % 10 == 0 else ""}
+        for i in range(size)
+    ]
+    fixed = build_auth_chain().compile()
+    adaptive = build_auth_chain().compile_adaptive(on_reorder=lambda event: None)
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        fixed_s = timeit.timeit(lambda: [fixed.handle(r) for r in requests], number=1)
+        adaptive_s = timeit.timeit(lambda: [adaptive.handle(r) for r in requests], number=1)
+    print(
+        f"{size} requests: fixed {size / fixed_s:,.0f} req/s, "
+        f"adaptive {size / adaptive_s:,.0f} req/s, "
+        f"order {' → '.join(adaptive.order)}, reorders {adaptive.metrics['reorders']}"
+    )
+
+
+def benchmark_decision_cache(size: int = 20_000, principals: int = 200) -> None:
+    print("\n--- Decision cache off vs on ---")
+    requests = [{"user": f"user-{i % principals}"} for i in range(size)]
+    uncached = PasswordCheckHandler().compile()
+    uncached_s = timeit.timeit(lambda: [uncached.handle(r) for r in requests], number=1)
+    print(f"{size} requests over {principals} users: off {size / uncached_s:,.0f} req/s")
+
+    # The second size sweeps 200 users through room for 100, so LRU never hits
+    for maxsize in (principals * 2, principals // 2):
+        cache = DecisionCache(key=lambda r: r["user"], maxsize=maxsize)
+        cached = CachedHandler(PasswordCheckHandler(), cache).compile()
+        cached_s = timeit.timeit(lambda: [cached.handle(r) for r in requests], number=1)
+        print(
+            f"maxsize={maxsize}: on {size / cached_s:,.0f} req/s "
+            f"({uncached_s / cached_s:.1f}x), cache {cache.stats()}"
+        )
+
+
+def benchmark() -> None:
+    benchmark_compiled_dispatch()
+    benchmark_batch_dispatch()
+    benchmark_adaptive_dispatch()
+    benchmark_decision_cache()
 
 
 # -----------------------------
 # Client Code
 # -----------------------------
-def main():
-    # Build the chain
-    chain = AuthenticationHandler(
+def build_auth_chain() -> Handler:
+    return AuthenticationHandler(
         AuthorizationHandler(
             ValidationHandler(
                 BusinessLogicHandler()
@@ -67,6 +593,11 @@ def main():
         )
     )
 
+
+def main():
+    # Build the chain
+    chain = build_auth_chain()
+
     print("\n--- Request 1: All good ---")
     request1 = {
         "authenticated": True,
@@ -83,6 +614,54 @@ def main():
     }
     chain.handle(request2)
 
+    print("\n--- Request 1 again, compiled chain ---")
+    compiled = chain.compile()
+    compiled.handle(request1)
+
+    print("\n--- Batch of requests, one check per handler ---")
+    batch = [request1, request2, {"authenticated": True, "is_admin": False, "data": "x"}]
+    print("Outcomes:", chain.handle_batch(batch))
+
+    print("\n--- Adaptive chain learns that validation rejects most traffic ---")
+    adaptive = chain.compile_adaptive(reorder_every=4)
+    for _ in range(2):
+        for data in ("", "", "", "payload"):
+            adaptive.handle({"authenticated": True, "is_admin": True, "data": data})
+    print("Order:", " → ".join(adaptive.order), "| metrics:", adaptive.metrics)
+
+    print("\n--- Async chain: auth + authz calls run concurrently ---")
+    async_chain = AsyncChain(
+        Concurrent(AsyncAuthenticationHandler(0.05), AsyncAuthorizationHandler(0.05)),
+        ValidationHandler(),
+        BusinessLogicHandler(),
+    )
+    start = time.perf_counter()
+    asyncio.run(async_chain.handle(request1))
+    print(f"Took {time.perf_counter() - start:.2f}s for two 0.05s identity calls")
+
+    print("\n--- Async chain: fast rejection cancels the slow check ---")
+    async_chain = AsyncChain(
+        Concurrent(AsyncAuthenticationHandler(0.01), AsyncAuthorizationHandler(1.0)),
+        BusinessLogicHandler(),
+    )
+    start = time.perf_counter()
+    asyncio.run(async_chain.handle(request2))
+    print(f"Took {time.perf_counter() - start:.2f}s instead of waiting 1s for authorization")
+
+    print("\n--- Cached authentication: repeat principals skip the check ---")
+    auth_cache = DecisionCache(key=lambda r: (r.get("user"), r.get("authenticated")), ttl=30.0)
+    cached_chain = CachedHandler(AuthenticationHandler(BusinessLogicHandler()), auth_cache)
+    for user, authenticated in (("alice", True), ("alice", True), ("bob", False), ("bob", False)):
+        cached_chain.handle({"user": user, "authenticated": authenticated})
+    print("Cache:", auth_cache.stats())
+
+    print("\n--- Very long chain (no recursion limit) ---")
+    long_chain = build_pass_through_chain(sys.getrecursionlimit() * 2).compile()
+    print(f"{len(long_chain)} handlers passed:", long_chain.handle(request1))
+
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        main()
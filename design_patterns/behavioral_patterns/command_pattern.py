@@ -1,4 +1,16 @@
+import itertools
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, wait
+from contextlib import contextmanager, redirect_stdout
+from typing import Callable
 
 
 # -----------------------------
@@ -14,17 +26,42 @@ class Command(ABC):
     def undo(self) -> None:
         pass
 
+    @property
+    def receiver(self) -> object | None:
+        """Object this command acts on; used to coalesce batched commands"""
+        return None
+
+    def cancels(self, previous: "Command") -> bool:
+        """True if running self right after `previous` is a no-op overall"""
+        return False
+
+    def supersedes(self, previous: "Command") -> bool:
+        """True if running self makes running `previous` first pointless"""
+        return False
+
 
 # -----------------------------
 # Receiver
 # -----------------------------
 class Light:
+    def __init__(self):
+        self.is_on = False
+
     def turn_on(self) -> None:
+        self.is_on = True
         print("💡 Light turned ON")
 
     def turn_off(self) -> None:
+        self.is_on = False
         print("🌑 Light turned OFF")
 
+    def snapshot(self) -> bool:
+        return self.is_on
+
+    def restore(self, state: bool) -> None:
+        self.is_on = state
+        print(f"♻️ Light restored to {'ON' if state else 'OFF'}")
+
 
 # -----------------------------
 # Concrete Commands
@@ -39,6 +76,17 @@ class LightOnCommand(Command):
     def undo(self) -> None:
         self.light.turn_off()
 
+    @property
+    def receiver(self) -> Light:
+        return self.light
+
+    def cancels(self, previous: Command) -> bool:
+        return isinstance(previous, LightOffCommand) and previous.light is self.light
+
+    def supersedes(self, previous: Command) -> bool:
+        # Both commands set the light to a fixed state: only the last one counts
+        return isinstance(previous, (LightOnCommand, LightOffCommand)) and previous.light is self.light
+
 
 class LightOffCommand(Command):
     def __init__(self, light: Light):
@@ -50,24 +98,739 @@ class LightOffCommand(Command):
     def undo(self) -> None:
         self.light.turn_on()
 
+    @property
+    def receiver(self) -> Light:
+        return self.light
+
+    def cancels(self, previous: Command) -> bool:
+        return isinstance(previous, LightOnCommand) and previous.light is self.light
+
+    def supersedes(self, previous: Command) -> bool:
+        # Both commands set the light to a fixed state: only the last one counts
+        return isinstance(previous, (LightOnCommand, LightOffCommand)) and previous.light is self.light
+
+
+class LightFlickerCommand(Command):
+    """Toggles a light but fails partway, e.g. a blown bulb"""
+
+    def __init__(self, light: Light):
+        self.light = light
+
+    @property
+    def receiver(self) -> Light:
+        return self.light
+
+    def execute(self) -> None:
+        self.light.turn_on()
+        raise RuntimeError("bulb blew while flickering")
+
+    def undo(self) -> None:
+        self.light.turn_off()
+
+
+# -----------------------------
+# Composite Commands
+# -----------------------------
+class MacroCommand(Command):
+    """Runs several commands as one; undo runs them backwards"""
+
+    def __init__(self, commands: list[Command]):
+        self.commands = list(commands)
+
+    def execute(self) -> None:
+        for command in self.commands:
+            command.execute()
+
+    def undo(self) -> None:
+        for command in reversed(self.commands):
+            command.undo()
+
+
+class TransactionCommand(MacroCommand):
+    """
+    All-or-nothing MacroCommand: if any command fails, the ones that
+    already ran are rolled back in reverse order and the error is re-raised.
+
+    When every receiver exposes snapshot()/restore(state), each receiver
+    is snapshotted once before running, and rollback/undo restore those
+    snapshots instead of undoing N commands one by one.
+    """
+
+    def __init__(self, commands: list[Command]):
+        super().__init__(commands)
+        self._snapshots: list[tuple[object, object]] | None = None
+
+    def _snapshot_receivers(self) -> list[object] | None:
+        receivers: dict[int, object] = {}
+        for command in self.commands:
+            receiver = command.receiver
+            if receiver is None or not hasattr(receiver, "snapshot"):
+                return None
+            receivers.setdefault(id(receiver), receiver)
+        return list(receivers.values())
+
+    def execute(self) -> None:
+        receivers = self._snapshot_receivers()
+        self._snapshots = None if receivers is None else [(r, r.snapshot()) for r in receivers]
+
+        completed: list[Command] = []
+        try:
+            for command in self.commands:
+                command.execute()
+                completed.append(command)
+        except BaseException:
+            print(f"↩️ Transaction failed after {len(completed)} commands, rolling back")
+            self._rollback(completed)
+            raise
+
+    def undo(self) -> None:
+        self._rollback(self.commands)
+
+    def _rollback(self, completed: list[Command]) -> None:
+        if self._snapshots is not None:
+            for receiver, state in reversed(self._snapshots):
+                receiver.restore(state)
+        else:
+            for command in reversed(completed):
+                command.undo()
+
+
+class CoalescedCommand(Command):
+    """
+    Stands in for a run of commands on one receiver where only the last
+    one matters: execute runs the last, undo runs the first one's undo,
+    which is what undoing the whole run would have left behind.
+    """
+
+    def __init__(self, first: Command, last: Command):
+        self.first = first
+        self.last = last
+
+    @property
+    def receiver(self) -> object | None:
+        return self.last.receiver
+
+    def execute(self) -> None:
+        self.last.execute()
+
+    def undo(self) -> None:
+        self.first.undo()
+
+
+def leaf_receivers(command: Command) -> list[object]:
+    """Receivers touched by a command, looking inside composite commands"""
+    receivers = []
+    stack = [command]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, MacroCommand):
+            stack.extend(current.commands)
+        elif isinstance(current, CoalescedCommand):
+            stack.extend((current.first, current.last))
+        elif current.receiver is not None:
+            receivers.append(current.receiver)
+    return receivers
+
+
+def coalesce(commands: list[Command]) -> list[Command]:
+    """
+    Drop commands that a later command on the same receiver supersedes.
+    A composite command is a barrier for every receiver it touches: nothing
+    is coalesced across it on those receivers.
+    """
+    kept: list[Command | None] = []
+    latest: dict[int, int] = {}
+    for command in commands:
+        receiver = command.receiver
+        if receiver is None:
+            for touched in leaf_receivers(command):
+                latest.pop(id(touched), None)
+        else:
+            position = latest.get(id(receiver))
+            previous = kept[position] if position is not None else None
+            if isinstance(previous, CoalescedCommand):
+                first, previous = previous.first, previous.last
+            else:
+                first = previous
+            if previous is not None and command.supersedes(previous):
+                command = CoalescedCommand(first, command)
+                kept[position] = None
+            latest[id(receiver)] = len(kept)
+        kept.append(command)
+    return [command for command in kept if command is not None]
+
+
+# -----------------------------
+# Undo History
+# -----------------------------
+def command_sizeof(command: Command) -> int:
+    """
+    Approximate memory held by a command: the object and its attributes,
+    plus every child of a MacroCommand/TransactionCommand/CoalescedCommand.
+    Receivers are shared, so they are not counted.
+    """
+    size = 0
+    seen: set[int] = set()
+    stack = [command]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if hasattr(current, "__dict__"):
+            size += sys.getsizeof(current.__dict__)
+        if isinstance(current, MacroCommand):
+            size += sys.getsizeof(current.commands)
+            stack.extend(current.commands)
+        elif isinstance(current, CoalescedCommand):
+            stack.extend((current.first, current.last))
+    return size
+
+
+class CommandHistory:
+    """
+    Undo stack on a ring buffer (deque).
+
+    - max_depth / max_bytes bound the history; the oldest commands are
+      evicted first and reported through `on_evict` and `evictions`.
+    - compact=True drops a command together with the one before it when
+      the two cancel out (e.g. LightOn then LightOff on the same Light),
+      so undo skips the pair that left the receiver unchanged.
+    """
+
+    def __init__(
+        self,
+        max_depth: int | None = None,
+        max_bytes: int | None = None,
+        compact: bool = False,
+        on_evict: Callable[[Command], None] | None = None,
+        sizeof: Callable[[Command], int] = command_sizeof,
+    ):
+        self._entries: deque[tuple[Command, int]] = deque()
+        self._max_depth = max_depth
+        self._max_bytes = max_bytes
+        self._compact = compact
+        self._on_evict = on_evict
+        self._sizeof = sizeof
+        self.bytes_used = 0
+        self.evictions = 0
+        self.compactions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        """Oldest to newest"""
+        return (command for command, _ in self._entries)
+
+    def push(self, command: Command) -> None:
+        if self._compact and self._entries and command.cancels(self._entries[-1][0]):
+            self._pop_entry()
+            self.compactions += 1
+            return
+
+        size = self._sizeof(command) if self._max_bytes is not None else 0
+        self._entries.append((command, size))
+        self.bytes_used += size
+        while self._entries and self._over_budget():
+            evicted, evicted_size = self._entries.popleft()
+            self.bytes_used -= evicted_size
+            self.evictions += 1
+            if self._on_evict:
+                self._on_evict(evicted)
+
+    def pop(self) -> Command:
+        return self._pop_entry()
+
+    def _pop_entry(self) -> Command:
+        command, size = self._entries.pop()
+        self.bytes_used -= size
+        return command
+
+    def _over_budget(self) -> bool:
+        if self._max_depth is not None and len(self._entries) > self._max_depth:
+            return True
+        return self._max_bytes is not None and self.bytes_used > self._max_bytes
+
+    def stats(self) -> dict:
+        return {
+            "depth": len(self._entries),
+            "bytes": self.bytes_used,
+            "evictions": self.evictions,
+            "compactions": self.compactions,
+        }
+
+
+# -----------------------------
+# Write-Ahead Journal
+# -----------------------------
+COMMAND_TYPES: dict[str, type[Command]] = {
+    "LightOnCommand": LightOnCommand,
+    "LightOffCommand": LightOffCommand,
+    "MacroCommand": MacroCommand,
+    "TransactionCommand": TransactionCommand,
+    "CoalescedCommand": CoalescedCommand,
+}
+
+
+class CommandJournal:
+    """
+    Append-only log of RemoteControl activity (one JSON record per line).
+
+    - Group commit: records are buffered and written + fsynced together
+      once `group_size` records are pending, or by a timer `group_interval`
+      seconds after the first record of the group, even if the remote is
+      idle. A crash loses at most the last uncommitted group.
+    - Snapshots: every `snapshot_every` records the receivers' state and
+      the undo stack are written to `<path>.snapshot` and the journal is
+      truncated, so replay only covers records since the snapshot.
+      Every record carries a sequence number, so a crash between writing
+      the snapshot and truncating the journal is replayed safely.
+    - A torn last line from a crash mid-commit is cut off during replay,
+      before anything new is appended after it.
+
+    `receivers` names every receiver that journaled commands act on;
+    the names are what ends up on disk. Receivers may expose
+    snapshot()/restore(state) to be captured in snapshots.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        receivers: dict[str, object],
+        group_size: int = 64,
+        group_interval: float = 0.01,
+        snapshot_every: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self._receivers = dict(receivers)
+        self._names = {id(receiver): name for name, receiver in receivers.items()}
+        self._group_size = group_size
+        self._group_interval = group_interval
+        self._snapshot_every = snapshot_every
+        self._clock = clock
+        self._pending: list[str] = []
+        self._last_commit = clock()
+        self._timer: threading.Timer | None = None
+        # The group timer commits from its own thread
+        self._lock = threading.RLock()
+        self._since_snapshot = 0
+        self._seq = 0
+        self._file = open(path, "a", encoding="utf-8")
+        self.stats = {"records": 0, "commits": 0, "snapshots": 0, "replayed": 0}
+
+    # --- encoding ---
+    def encode(self, command: Command) -> dict:
+        name = type(command).__name__
+        if isinstance(command, MacroCommand):
+            return {"type": name, "commands": [self.encode(c) for c in command.commands]}
+        if isinstance(command, CoalescedCommand):
+            return {"type": name, "first": self.encode(command.first), "last": self.encode(command.last)}
+        name_of_receiver = self._names.get(id(command.receiver))
+        if name_of_receiver is None:
+            raise ValueError(f"{name} acts on a receiver the journal has no name for")
+        return {"type": name, "receiver": name_of_receiver}
+
+    def decode(self, record: dict) -> Command:
+        command_type = COMMAND_TYPES[record["type"]]
+        if issubclass(command_type, MacroCommand):
+            return command_type([self.decode(r) for r in record["commands"]])
+        if issubclass(command_type, CoalescedCommand):
+            return command_type(self.decode(record["first"]), self.decode(record["last"]))
+        return command_type(self._receivers[record["receiver"]])
+
+    # --- writing ---
+    def append(self, op: str, encoded: dict | None = None) -> None:
+        """Journal an operation; `encoded` is the command as returned by encode()"""
+        with self._lock:
+            self._seq += 1
+            record = {"seq": self._seq, "op": op}
+            if encoded is not None:
+                record["command"] = encoded
+            self._pending.append(json.dumps(record, separators=(",", ":")) + "\n")
+            self._since_snapshot += 1
+            self.stats["records"] += 1
+            if (
+                len(self._pending) >= self._group_size
+                or self._clock() - self._last_commit >= self._group_interval
+            ):
+                self.commit()
+            elif len(self._pending) == 1 and self._group_interval != float("inf"):
+                self._timer = threading.Timer(self._group_interval, self.commit)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def commit(self) -> None:
+        """Write pending records and fsync them in one go"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._last_commit = self._clock()
+            if not self._pending:
+                return
+            self._file.write("".join(self._pending))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending.clear()
+            self.stats["commits"] += 1
+
+    @property
+    def needs_snapshot(self) -> bool:
+        return self._since_snapshot >= self._snapshot_every
+
+    def snapshot(self, history: CommandHistory) -> None:
+        with self._lock:
+            self.commit()
+            state = {
+                "seq": self._seq,
+                "receivers": {
+                    name: receiver.snapshot()
+                    for name, receiver in self._receivers.items()
+                    if hasattr(receiver, "snapshot")
+                },
+                "history": [self.encode(command) for command in history],
+            }
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as tmp:
+                json.dump(state, tmp)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+
+            self._file.close()
+            self._file = open(self.path, "w", encoding="utf-8")
+            os.fsync(self._file.fileno())
+            self._since_snapshot = 0
+            self.stats["snapshots"] += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self.commit()
+            self._file.close()
+
+    # --- recovery ---
+    def replay(self, remote: "RemoteControl") -> None:
+        """Restore receivers and the undo stack from the snapshot + journal"""
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                state = json.load(f)
+            snapshot_seq = state["seq"]
+            for name, receiver_state in state["receivers"].items():
+                self._receivers[name].restore(receiver_state)
+            for record in state["history"]:
+                remote.history.push(self.decode(record))
+
+        self._seq = snapshot_seq
+        complete = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash mid-commit
+                complete += len(line)
+                record = json.loads(line)
+                if record["seq"] <= snapshot_seq:
+                    continue
+                if record["op"] == "execute":
+                    remote._execute(self.decode(record["command"]), journal=False)
+                else:
+                    remote._undo(journal=False)
+                self._seq = record["seq"]
+                self._since_snapshot += 1
+                self.stats["replayed"] += 1
+        if complete < os.path.getsize(self.path):
+            # Drop the torn line so the next record starts on a line of its own
+            os.truncate(self.path, complete)
+
+
+# -----------------------------
+# Parallel Executor
+# -----------------------------
+def _run(command: Command, future: Future) -> None:
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        command.execute()
+    except BaseException as error:
+        future.set_exception(error)
+    else:
+        future.set_result(command)
+
+
+class _ShardBarrier:
+    """
+    Queue entry for a command whose receivers live on several workers.
+    Every involved worker stops at it; the last to arrive runs the
+    command while the others wait, so it keeps its place in each queue.
+    """
+
+    def __init__(self, command: Command, future: Future, parties: int):
+        self.command = command
+        self.future = future
+        self._waiting = parties
+        self._done = False
+        self._condition = threading.Condition()
+
+    def arrive(self) -> None:
+        with self._condition:
+            self._waiting -= 1
+            if self._waiting > 0 or self._done:
+                while not self._done:
+                    self._condition.wait()
+                return
+        try:
+            _run(self.command, self.future)
+        finally:
+            self.cancel()
+
+    def cancel(self) -> None:
+        """Release the workers waiting here"""
+        with self._condition:
+            self._done = True
+            self._condition.notify_all()
+
+
+class CommandExecutor:
+    """
+    Runs Command.execute on a pool of worker threads.
+
+    Each worker owns one bounded queue, and commands are routed by their
+    receiver, so all commands for one receiver land on the same worker and
+    run in submission order, while different receivers run in parallel.
+    Composite commands are routed by the receivers of their children;
+    when those span workers, each involved worker pauses at the command
+    until it has run, keeping submission order on every receiver.
+    Commands without any receiver are spread round-robin.
+
+    submit() blocks while the target queue is full (backpressure); with
+    `submit_timeout` set it raises queue.Full instead of waiting forever.
+    """
+
+    def __init__(self, workers: int = 4, queue_size: int = 1024, submit_timeout: float | None = None):
+        self._queues: list[queue.Queue] = [queue.Queue(maxsize=queue_size) for _ in range(workers)]
+        self._submit_timeout = submit_timeout
+        self._round_robin = itertools.count()
+        # Cross-worker commands enter all their queues in one global order
+        self._cross_shard_lock = threading.Lock()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(target=self._work, args=(q,), name=f"command-worker-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, command: Command) -> Future:
+        if self._shutdown:
+            raise RuntimeError("cannot submit after shutdown")
+        # id() is allocation-aligned; hashing a tuple mixes the low bits
+        shards = sorted({hash((id(r),)) % len(self._queues) for r in leaf_receivers(command)})
+        if not shards:
+            shards = [next(self._round_robin) % len(self._queues)]
+
+        future: Future = Future()
+        if len(shards) == 1:
+            self._queues[shards[0]].put((command, future), timeout=self._submit_timeout)
+            return future
+
+        barrier = _ShardBarrier(command, future, len(shards))
+        with self._cross_shard_lock:
+            try:
+                for shard in shards:
+                    self._queues[shard].put(barrier, timeout=self._submit_timeout)
+            except queue.Full:
+                # Workers already holding the barrier must not wait for the rest
+                future.cancel()
+                barrier.cancel()
+                raise
+        return future
+
+    def backlog(self) -> list[int]:
+        """Queued commands per worker"""
+        return [q.qsize() for q in self._queues]
+
+    @staticmethod
+    def _work(work_queue: queue.Queue) -> None:
+        while True:
+            item = work_queue.get()
+            if item is None:
+                return
+            if isinstance(item, _ShardBarrier):
+                item.arrive()
+            else:
+                _run(*item)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting commands; queued commands still run"""
+        self._shutdown = True
+        for work_queue in self._queues:
+            work_queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def __enter__(self) -> "CommandExecutor":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+
 
 # -----------------------------
 # Invoker
 # -----------------------------
 class RemoteControl:
-    def __init__(self):
-        self._history: list[Command] = []
+    def __init__(
+        self,
+        history: CommandHistory | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        journal: CommandJournal | None = None,
+    ):
+        self._history = history if history is not None else CommandHistory()
+        self._clock = clock
+        self._journal = journal
+        self._batch: list[Command] | None = None
+        self._batch_max_commands = 0
+        self._batch_window = 0.0
+        self._batch_opened_at = 0.0
+        self._batch_timer: threading.Timer | None = None
+        # The batch timer flushes from its own thread
+        self._lock = threading.RLock()
+        self.batch_stats = {"submitted": 0, "executed": 0, "saved": 0, "batches": 0}
+        if journal is not None:
+            journal.replay(self)
+
+    @property
+    def history(self) -> CommandHistory:
+        return self._history
 
     def press_button(self, command: Command) -> None:
+        with self._lock:
+            if self._batch is None:
+                self._execute(command)
+                return
+
+            if not self._batch:
+                self._batch_opened_at = self._clock()
+                self._arm_batch_timer()
+            self._batch.append(command)
+            if (
+                len(self._batch) >= self._batch_max_commands
+                or self._clock() - self._batch_opened_at >= self._batch_window
+            ):
+                self.flush()
+
+    def _execute(self, command: Command, journal: bool = True) -> None:
+        journal = journal and self._journal is not None
+        # Encode first: a command the journal cannot record must not run
+        encoded = self._journal.encode(command) if journal else None
         command.execute()
-        self._history.append(command)
+        self._history.push(command)
+        if journal:
+            self._journal.append("execute", encoded)
+            self._maybe_snapshot()
 
-    def press_undo(self) -> None:
+    def _undo(self, journal: bool = True) -> None:
         if not self._history:
             print("⚠️ Nothing to undo")
             return
         last_command = self._history.pop()
         last_command.undo()
+        if journal and self._journal is not None:
+            self._journal.append("undo")
+            self._maybe_snapshot()
+
+    def _maybe_snapshot(self) -> None:
+        if self._journal.needs_snapshot:
+            self._journal.snapshot(self._history)
+
+    # Batching: buffer presses, coalesce them per receiver, run the rest
+    # as one MacroCommand so a single undo reverts the whole batch.
+    # A batch is flushed when it reaches max_commands, or by a timer
+    # `window` seconds after its first press; errors raised by a
+    # timer-driven flush surface through threading.excepthook.
+    def start_batch(self, max_commands: int = 100, window: float = 0.05) -> None:
+        with self._lock:
+            # Presses buffered under the previous settings still run
+            self.flush()
+            self._batch = []
+            self._batch_max_commands = max_commands
+            self._batch_window = window
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._batch_timer is not None:
+                self._batch_timer.cancel()
+                self._batch_timer = None
+            if not self._batch:
+                return
+            submitted = len(self._batch)
+            commands = coalesce(self._batch)
+            self._batch = []
+
+            self.batch_stats["submitted"] += submitted
+            self.batch_stats["executed"] += len(commands)
+            self.batch_stats["saved"] += submitted - len(commands)
+            self.batch_stats["batches"] += 1
+            self._execute(commands[0] if len(commands) == 1 else MacroCommand(commands))
+
+    def end_batch(self) -> None:
+        with self._lock:
+            self.flush()
+            self._batch = None
+
+    def _arm_batch_timer(self) -> None:
+        self._batch_timer = threading.Timer(self._batch_window, self.flush)
+        self._batch_timer.daemon = True
+        self._batch_timer.start()
+
+    @contextmanager
+    def batch(self, max_commands: int = 100, window: float = 0.05):
+        self.start_batch(max_commands, window)
+        try:
+            yield self
+        finally:
+            self.end_batch()
+
+    def press_undo(self) -> None:
+        with self._lock:
+            # Buffered presses happened before this undo
+            self.flush()
+            self._undo()
+
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+def benchmark_group_commit(presses: int = 2000) -> None:
+    print("\n--- Journal: fsync per press vs group commit ---")
+    for group_size in (1, 64):
+        with tempfile.TemporaryDirectory() as tmp:
+            light = Light()
+            journal = CommandJournal(
+                os.path.join(tmp, "remote.journal"), {"light": light},
+                group_size=group_size, group_interval=float("inf"),
+            )
+            remote = RemoteControl(journal=journal)
+            commands = [LightOnCommand(light), LightOffCommand(light)]
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                start = time.perf_counter()
+                for i in range(presses):
+                    remote.press_button(commands[i % 2])
+                journal.close()
+                elapsed = time.perf_counter() - start
+            print(
+                f"group_size={group_size:>3}: {presses / elapsed:,.0f} presses/s, "
+                f"{journal.stats['commits']} fsyncs"
+            )
+
+
+def benchmark() -> None:
+    benchmark_group_commit()
 
 
 # -----------------------------
@@ -92,6 +855,77 @@ def main():
     print("\n--- Undo again ---")
     remote.press_undo()
 
+    print("\n--- Bounded, compacting history ---")
+    bounded = RemoteControl(CommandHistory(max_depth=2, compact=True))
+    bounded.press_button(light_on)
+    bounded.press_button(light_off)   # cancels the ON above
+    bounded.press_button(light_off)
+    bounded.press_button(LightOffCommand(Light()))
+    bounded.press_button(LightOnCommand(Light()))  # evicts the oldest entry
+    print("History:", bounded.history.stats())
+
+    print("\n--- Batched presses: only the final state per light runs ---")
+    porch = Light()
+    batched = RemoteControl()
+    with batched.batch(max_commands=10, window=1.0):
+        for _ in range(3):
+            batched.press_button(LightOnCommand(porch))
+            batched.press_button(LightOffCommand(porch))
+        batched.press_button(LightOnCommand(light))
+    print("Batch stats:", batched.batch_stats)
+
+    print("\n--- Undo the whole batch ---")
+    batched.press_undo()
+
+    print("\n--- Transaction: all lights on, or none ---")
+    desk, lamp = Light(), Light()
+    transactional = RemoteControl()
+    try:
+        transactional.press_button(TransactionCommand([
+            LightOnCommand(desk), LightOnCommand(lamp), LightFlickerCommand(lamp),
+        ]))
+    except RuntimeError as error:
+        print(f"❌ {error}; desk on={desk.is_on}, lamp on={lamp.is_on}, history={len(transactional.history)}")
+
+    transactional.press_button(TransactionCommand([LightOnCommand(desk), LightOnCommand(lamp)]))
+    print("\n--- Undo the transaction as one entry ---")
+    transactional.press_undo()
+
+    print("\n--- Parallel executor: lights in parallel, each light in order ---")
+    lights = [Light() for _ in range(3)]
+    with CommandExecutor(workers=3, queue_size=4) as executor:
+        futures = [
+            executor.submit(command_type(target))
+            for command_type in (LightOnCommand, LightOffCommand, LightOnCommand)
+            for target in lights
+        ]
+        wait(futures)
+    print("Completed:", sum(f.done() for f in futures), "| final states:", [l.is_on for l in lights])
+
+    print("\n--- Journaled remote survives a restart ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "remote.journal")
+        kitchen, hall = Light(), Light()
+        receivers = {"kitchen": kitchen, "hall": hall}
+        journal = CommandJournal(path, receivers, group_size=8, snapshot_every=4)
+        durable = RemoteControl(journal=journal)
+        for command in (LightOnCommand(kitchen), LightOnCommand(hall), LightOffCommand(kitchen),
+                        LightOffCommand(hall), LightOnCommand(kitchen)):
+            durable.press_button(command)
+        journal.close()
+        print("Journal:", journal.stats)
+
+        print("\n... restart ...")
+        kitchen, hall = Light(), Light()
+        journal = CommandJournal(path, {"kitchen": kitchen, "hall": hall})
+        durable = RemoteControl(journal=journal)
+        print(f"Recovered: kitchen on={kitchen.is_on}, hall on={hall.is_on}, undo depth={len(durable.history)}")
+        durable.press_undo()
+        journal.close()
+
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        main()
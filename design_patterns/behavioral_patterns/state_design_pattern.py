@@ -1,3 +1,11 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import timeit
+import tracemalloc
 from abc import ABC, abstractmethod
 
 
@@ -5,10 +13,22 @@ from abc import ABC, abstractmethod
 # State Interface
 # -----------------------------
 class OrderState(ABC):
+    """
+    States carry no per-order data, so each state class has exactly one
+    shared instance: PaidState() always returns the same object.
+    """
+
+    __slots__ = ()
+    _instances: dict[type, "OrderState"] = {}
+
+    def __new__(cls):
+        instance = OrderState._instances.get(cls)
+        if instance is None:
+            instance = OrderState._instances[cls] = super().__new__(cls)
+        return instance
 
-    @abstractmethod
     def next(self, order) -> None:
-        pass
+        order.advance()
 
     @abstractmethod
     def name(self) -> str:
@@ -19,54 +39,436 @@ class OrderState(ABC):
 # Concrete States
 # -----------------------------
 class CreatedState(OrderState):
-    def next(self, order) -> None:
-        print("💰 Payment completed")
-        order.set_state(PaidState())
+    __slots__ = ()
 
     def name(self) -> str:
         return "CREATED"
 
 
 class PaidState(OrderState):
-    def next(self, order) -> None:
-        print("📦 Order shipped")
-        order.set_state(ShippedState())
+    __slots__ = ()
 
     def name(self) -> str:
         return "PAID"
 
 
 class ShippedState(OrderState):
-    def next(self, order) -> None:
-        print("🚚 Order delivered")
-        order.set_state(DeliveredState())
+    __slots__ = ()
 
     def name(self) -> str:
         return "SHIPPED"
 
 
 class DeliveredState(OrderState):
-    def next(self, order) -> None:
-        print("✅ Order already delivered. No further actions.")
+    __slots__ = ()
 
     def name(self) -> str:
         return "DELIVERED"
 
 
+# -----------------------------
+# Transition Table
+# -----------------------------
+# state -> (next state or None if final, message printed when tracing)
+TRANSITIONS: dict[str, tuple[str | None, str]] = {
+    "CREATED": ("PAID", "💰 Payment completed"),
+    "PAID": ("SHIPPED", "📦 Order shipped"),
+    "SHIPPED": ("DELIVERED", "🚚 Order delivered"),
+    "DELIVERED": (None, "✅ Order already delivered. No further actions."),
+}
+
+STATES: dict[str, OrderState] = {
+    state.name(): state
+    for state in (CreatedState(), PaidState(), ShippedState(), DeliveredState())
+}
+
+# Resolved once: state object -> (next state object, message)
+_NEXT: dict[OrderState, tuple[OrderState | None, str]] = {
+    STATES[name]: (STATES[next_name] if next_name else None, message)
+    for name, (next_name, message) in TRANSITIONS.items()
+}
+
+
 # -----------------------------
 # Context
 # -----------------------------
+# Lock striping: orders share a fixed pool of locks instead of one each
+_STRIPES = tuple(threading.Lock() for _ in range(64))
+
+
+def _stripe_for(order: "Order") -> threading.Lock:
+    return _STRIPES[hash(order) % len(_STRIPES)]
+
+
 class Order:
-    def __init__(self):
-        self._state: OrderState = CreatedState()
+    __slots__ = ("_state", "_version", "trace", "order_id", "_log")
+
+    def __init__(
+        self,
+        trace: bool = True,
+        state: OrderState | None = None,
+        order_id: int | None = None,
+        log: "OrderEventLog | None" = None,
+    ):
+        if log is not None and order_id is None:
+            raise ValueError("an order written to an event log needs an order_id")
+        self._state: OrderState = state if state is not None else STATES["CREATED"]
+        self._version = 0
+        self.trace = trace
+        self.order_id = order_id
+        self._log = log
+
+    @property
+    def state(self) -> OrderState:
+        return self._state
+
+    @property
+    def version(self) -> int:
+        """Bumped on every state change"""
+        return self._version
 
     def set_state(self, state: OrderState) -> None:
+        if self._log is not None:
+            self._log.append(self.order_id, self._state.name(), state.name())
+        # State first, then version: a reader that sees the new version
+        # is guaranteed to see the new state
         self._state = state
-        print(f"➡️ State changed to {self._state.name()}")
+        self._version += 1
+        if self.trace:
+            print(f"➡️ State changed to {self._state.name()}")
+
+    def advance(self) -> None:
+        """Apply the transition table to the current state"""
+        next_state, message = _NEXT[self._state]
+        if self.trace:
+            print(message)
+        if next_state is not None:
+            self.set_state(next_state)
 
     def proceed(self) -> None:
-        print(f"\nCurrent State: {self._state.name()}")
-        self._state.next(self)
+        if self.trace:
+            print(f"\nCurrent State: {self._state.name()}")
+        self.advance()
+
+    # Thread-safe transitions: optimistic compare-and-set on the version
+    def compare_and_set(self, expected_version: int, state: OrderState) -> bool:
+        """Set `state` only if nobody changed the order since `expected_version`"""
+        with _stripe_for(self):
+            if self._version != expected_version:
+                return False
+            self.set_state(state)
+            return True
+
+    def try_proceed(self) -> bool:
+        """
+        Advance one step if no other thread got there first. Returns
+        whether this call applied the transition; False means the order
+        moved concurrently (re-read and retry) or is already final.
+        """
+        version = self._version
+        next_state, _ = _NEXT[self._state]
+        if next_state is None:
+            return False
+        return self.compare_and_set(version, next_state)
+
+
+# -----------------------------
+# Columnar Order Store
+# -----------------------------
+# One byte per order: the state's position in TRANSITIONS
+STATE_NAMES: tuple[str, ...] = tuple(TRANSITIONS)
+STATE_CODES: dict[str, int] = {name: code for code, name in enumerate(STATE_NAMES)}
+
+# The high bit marks orders selected by a proceed() mask
+_SELECTED = 0x80
+_MASK_TO_SELECTED = bytes([0] + [_SELECTED] * 255)
+_SELECT_ALL = bytes(code | _SELECTED for code in range(256))
+
+
+def _build_proceed_table() -> bytes:
+    """bytes.translate table: selected codes move to their next state"""
+    table = bytearray(range(256))
+    for name, (next_name, _) in TRANSITIONS.items():
+        code = STATE_CODES[name]
+        table[code] = code
+        table[code | _SELECTED] = STATE_CODES[next_name] if next_name else code
+    return bytes(table)
+
+
+_PROCEED_TABLE = _build_proceed_table()
+
+
+class OrderStore:
+    """
+    Many orders held as a compact bytearray of state codes.
+
+    proceed() applies the transition table to every selected order in one
+    bytes.translate() pass, which runs in C over the whole array.
+    """
+
+    __slots__ = ("states",)
+
+    def __init__(self, size: int = 0):
+        self.states = bytearray(size)  # every order starts CREATED
+
+    @classmethod
+    def from_orders(cls, orders: list[Order]) -> "OrderStore":
+        store = cls()
+        store.states = bytearray(STATE_CODES[order.state.name()] for order in orders)
+        return store
+
+    def to_orders(self, trace: bool = False) -> list[Order]:
+        states = [STATES[name] for name in STATE_NAMES]
+        return [Order(trace, states[code]) for code in self.states]
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def count(self, state_name: str) -> int:
+        return self.states.count(STATE_CODES[state_name])
+
+    def proceed(self, mask: bytes | bytearray | list[bool] | None = None) -> dict[tuple[str, str], int]:
+        """
+        Advance every order whose mask entry is truthy (all orders if mask
+        is None). Returns how many orders took each transition.
+        """
+        size = len(self.states)
+        if mask is None:
+            marked = self.states.translate(_SELECT_ALL)
+        else:
+            mask_bits = bytes(mask).translate(_MASK_TO_SELECTED)
+            if len(mask_bits) != size:
+                raise ValueError("mask length must match the number of orders")
+            # Bitwise OR of two byte arrays, done on two big ints
+            marked = (
+                int.from_bytes(self.states, "little") | int.from_bytes(mask_bits, "little")
+            ).to_bytes(size, "little")
+
+        counts = {}
+        for name, (next_name, _) in TRANSITIONS.items():
+            if next_name is not None:
+                counts[(name, next_name)] = marked.count(STATE_CODES[name] | _SELECTED)
+        self.states = bytearray(marked.translate(_PROCEED_TABLE))
+        return counts
+
+
+# -----------------------------
+# Event-Sourced Log
+# -----------------------------
+# Log lines are parsed as bytes; this maps them back to (known) state names
+_STATE_NAMES_BY_BYTES = {name.encode(): name for name in STATES}
+
+
+class OrderEventLog:
+    """
+    Append-only log of state transitions ("<order_id> <from> <to>" per
+    line) with periodic snapshots.
+
+    Every `snapshot_every` events, the current state of every order and the
+    log's byte offset are written to `<path>.snapshot`. A rebuild loads the
+    snapshot and replays only the events after that offset. The log itself
+    is never truncated, so it keeps the full history, except for a torn
+    last line from a crash mid-write, which is cut off on open.
+    """
+
+    def __init__(self, path: str, snapshot_every: int = 10_000):
+        self.path = path
+        self.snapshot_path = path + ".snapshot"
+        self._snapshot_every = snapshot_every
+        self._file = None
+        self._lock = threading.Lock()
+        self._states: dict[int, str] = {}
+        self._since_snapshot = 0
+        if os.path.exists(path):
+            self._states, self._since_snapshot, complete = self._replay()
+            if complete < os.path.getsize(path):
+                # Drop the torn line so the next event starts on a line of its own
+                os.truncate(path, complete)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, order_id: int, from_state: str, to_state: str) -> None:
+        with self._lock:
+            self._file.write(f"{order_id} {from_state} {to_state}\n")
+            self._states[order_id] = to_state
+            self._since_snapshot += 1
+            if self._since_snapshot >= self._snapshot_every:
+                self.snapshot()
+
+    def snapshot(self) -> None:
+        self._file.flush()
+        state = {"offset": self._file.tell(), "states": self._states}
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as tmp:
+            json.dump(state, tmp)
+        os.replace(tmp_path, self.snapshot_path)
+        self._since_snapshot = 0
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _load_snapshot(self) -> tuple[int, dict[int, str]]:
+        if not os.path.exists(self.snapshot_path):
+            return 0, {}
+        with open(self.snapshot_path, encoding="utf-8") as f:
+            state = json.load(f)
+        return state["offset"], {int(order_id): name for order_id, name in state["states"].items()}
+
+    def _replay(self, only: int | None = None) -> tuple[dict[int, str], int, int]:
+        """
+        Snapshot states plus the events after it; returns (states, events
+        replayed, offset just past the last complete line)
+        """
+        if self._file is not None:
+            self._file.flush()
+        offset, states = self._load_snapshot()
+        if only is not None:
+            states = {only: states[only]} if only in states else {}
+
+        events = 0
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write from a crash mid-append
+                order_id, _, raw_state = line.split()
+                to_state = _STATE_NAMES_BY_BYTES.get(raw_state)
+                if to_state is None:
+                    raise ValueError(f"unknown state {raw_state!r} in {self.path} at byte {offset}")
+                offset += len(line)
+                events += 1
+                if only is None or int(order_id) == only:
+                    states[int(order_id)] = to_state
+        return states, events, offset
+
+    def rebuild_all(self) -> dict[int, str]:
+        """Current state name of every order in the log"""
+        return self._replay()[0]
+
+    def rebuild(self, order_id: int) -> str:
+        """Current state name of one order"""
+        return self._replay(order_id)[0].get(order_id, "CREATED")
+
+    def load_orders(self, trace: bool = False) -> dict[int, Order]:
+        """Rebuild Order objects that keep appending to this log"""
+        return {
+            order_id: Order(trace, STATES[name], order_id, self)
+            for order_id, name in self.rebuild_all().items()
+        }
+
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+def benchmark_proceed(orders: int = 200_000) -> None:
+    print(f"\n--- {orders} orders, CREATED -> DELIVERED, tracing off ---")
+    tracemalloc.start()
+    batch = [Order(trace=False) for _ in range(orders)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    def advance_all() -> None:
+        for order in batch:
+            order.proceed()
+            order.proceed()
+            order.proceed()
+
+    elapsed = timeit.timeit(advance_all, number=1)
+    print(
+        f"{size / orders:.0f} bytes/order, "
+        f"{elapsed / (orders * 3) * 1e9:.0f} ns/transition"
+    )
+
+
+def benchmark_bulk_proceed(orders: int = 1_000_000) -> None:
+    print(f"\n--- {orders} orders, advance every other order ---")
+    mask = bytes([1, 0]) * (orders // 2)
+
+    objects = [Order(trace=False) for _ in range(orders)]
+    selected = objects[::2]
+    object_s = timeit.timeit(lambda: [order.advance() for order in selected], number=1)
+
+    store = OrderStore(orders)
+    store_s = timeit.timeit(lambda: store.proceed(mask), number=1)
+    print(
+        f"Order.advance() loop: {object_s * 1000:7.1f} ms\n"
+        f"OrderStore.proceed:   {store_s * 1000:7.1f} ms ({object_s / store_s:.0f}x)"
+    )
+
+
+def benchmark_rebuild(sizes=(10_000, 100_000, 1_000_000), orders: int = 10_000) -> None:
+    print(f"\n--- Rebuild {orders} orders from the event log ---")
+    cycle = [STATES[name] for name in STATE_NAMES]
+    for events in sizes:
+        timings = []
+        for snapshot_every in (10**9, 10_000):
+            with tempfile.TemporaryDirectory() as tmp:
+                log = OrderEventLog(os.path.join(tmp, "orders.log"), snapshot_every)
+                batch = [Order(False, None, order_id, log) for order_id in range(orders)]
+                for i in range(events):
+                    order = batch[i % orders]
+                    order.set_state(cycle[(i // orders + 1) % len(cycle)])
+                log.close()
+
+                start = time.perf_counter()
+                OrderEventLog(log.path).close()
+                timings.append(time.perf_counter() - start)
+        print(
+            f"{events:>9} events: full replay {timings[0] * 1000:7.1f} ms, "
+            f"snapshot + tail {timings[1] * 1000:7.1f} ms"
+        )
+
+
+def stress_concurrent_transitions(orders: int, threads: int) -> tuple[float, int, int]:
+    """
+    Every thread tries to push every order to DELIVERED. Returns elapsed
+    seconds, applied transitions and lost CAS races; the applied count
+    must be exactly 3 per order.
+    """
+    batch = [Order(trace=False) for _ in range(orders)]
+    applied = [0] * threads
+    lost = [0] * threads
+    start_line = threading.Barrier(threads)
+
+    def worker(index: int) -> None:
+        start_line.wait()
+        for order in batch:
+            while order.state is not STATES["DELIVERED"]:
+                if order.try_proceed():
+                    applied[index] += 1
+                else:
+                    lost[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    assert sum(applied) == 3 * orders, "lost or duplicated transitions"
+    assert all(order.version == 3 for order in batch)
+    return elapsed, sum(applied), sum(lost)
+
+
+def benchmark_concurrent_transitions(orders: int = 20_000) -> None:
+    print(f"\n--- Concurrent try_proceed on {orders} orders ---")
+    for threads in (1, 4, 16):
+        elapsed, applied, lost = stress_concurrent_transitions(orders, threads)
+        print(
+            f"{threads:>2} threads: {applied / elapsed:,.0f} transitions/s, "
+            f"{lost} lost CAS races, all orders DELIVERED exactly once"
+        )
+
+
+def benchmark() -> None:
+    benchmark_proceed()
+    benchmark_bulk_proceed()
+    benchmark_rebuild()
+    benchmark_concurrent_transitions()
 
 
 # -----------------------------
@@ -80,6 +482,39 @@ def main():
     order.proceed()   # SHIPPED -> DELIVERED
     order.proceed()   # DELIVERED -> no-op
 
+    print("\nShared state objects:", PaidState() is STATES["PAID"])
+
+    print("\n--- Nightly batch: columnar store ---")
+    store = OrderStore.from_orders([order, Order(trace=False), Order(trace=False)])
+    print("Orders 1 and 2 paid:", store.proceed([False, True, True]))
+    print("Everyone moves on:  ", store.proceed())
+    print("States:", [o.state.name() for o in store.to_orders()])
+
+    print("\n--- Two callbacks race to mark an order paid ---")
+    contested = Order(trace=False)
+    seen = contested.version
+    print("Payment callback:", contested.compare_and_set(seen, STATES["PAID"]))
+    print("Retry with stale version:", contested.compare_and_set(seen, STATES["PAID"]))
+    print("State:", contested.state.name(), "| version:", contested.version)
+
+    print("\n--- Event-sourced orders survive a restart ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        log = OrderEventLog(os.path.join(tmp, "orders.log"), snapshot_every=3)
+        first, second = Order(False, None, 1, log), Order(False, None, 2, log)
+        for _ in range(3):
+            first.proceed()
+        second.proceed()
+        log.close()
+
+        log = OrderEventLog(log.path)
+        restored = log.load_orders()
+        print("Rebuilt:", {order_id: o.state.name() for order_id, o in restored.items()})
+        print("Order 2 alone:", log.rebuild(2))
+        log.close()
+
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        main()
@@ -1,7 +1,31 @@
+import random
+import sys
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from decimal import Decimal
 
 # Strategy Pattern lets you define a family of algorithms, put each one in a separate class, and make them interchangeable at runtime.
 
+# -----------------------------
+# Payment Result
+# -----------------------------
+@dataclass(frozen=True)
+class PaymentResult:
+    amount: Decimal
+    method: str
+    ok: bool
+    error: str | None = None
+
+
+def to_decimal(amount: Decimal | int | float | str) -> Decimal:
+    """Exact amount; floats go through str() so 0.1 stays 0.1"""
+    if isinstance(amount, Decimal):
+        return amount
+    return Decimal(str(amount))
+
+
 # -----------------------------
 # Strategy Interface
 # -----------------------------
@@ -11,6 +35,19 @@ class PaymentStrategy(ABC):
     def pay(self, amount: float) -> None:
         pass
 
+    def pay_batch(self, amounts: list[Decimal]) -> list[PaymentResult]:
+        """Optional bulk hook; by default pays one amount at a time"""
+        method = type(self).__name__
+        results = []
+        for amount in amounts:
+            try:
+                self.pay(amount)
+            except Exception as error:
+                results.append(PaymentResult(amount, method, False, str(error)))
+            else:
+                results.append(PaymentResult(amount, method, True))
+        return results
+
 
 # -----------------------------
 # Concrete Strategies
@@ -19,17 +56,150 @@ class CardPayment(PaymentStrategy):
     def pay(self, amount: float) -> None:
         print(f"💳 Paid ₹{amount} using Card")
 
+    def pay_batch(self, amounts: list[Decimal]) -> list[PaymentResult]:
+        # One settlement call for the whole group
+        total = sum(amounts, Decimal(0))
+        print(f"💳 Paid ₹{total} using Card ({len(amounts)} payments in one settlement)")
+        return [PaymentResult(amount, "CardPayment", True) for amount in amounts]
+
 
 class UpiPayment(PaymentStrategy):
     def pay(self, amount: float) -> None:
         print(f"📱 Paid ₹{amount} using UPI")
 
+    def pay_batch(self, amounts: list[Decimal]) -> list[PaymentResult]:
+        total = sum(amounts, Decimal(0))
+        print(f"📱 Paid ₹{total} using UPI ({len(amounts)} payments in one collect request)")
+        return [PaymentResult(amount, "UpiPayment", True) for amount in amounts]
+
 
 class WalletPayment(PaymentStrategy):
     def pay(self, amount: float) -> None:
         print(f"👛 Paid ₹{amount} using Wallet")
 
 
+# -----------------------------
+# Adaptive Routing Strategy
+# -----------------------------
+class RailStats:
+    """Sliding window of recent latencies and outcomes for one strategy"""
+
+    def __init__(self, window: int):
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.failures: deque[bool] = deque(maxlen=window)
+        self.last_used = float("-inf")
+        self._sorted: list[float] | None = None
+
+    def record(self, latency: float, failed: bool) -> None:
+        self.latencies.append(latency)
+        self.failures.append(failed)
+        self._sorted = None
+
+    def reset(self) -> None:
+        self.latencies.clear()
+        self.failures.clear()
+        self._sorted = None
+
+    @property
+    def samples(self) -> int:
+        return len(self.failures)
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.failures) / len(self.failures) if self.failures else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        if not self.latencies:
+            return 0.0
+        if self._sorted is None:
+            self._sorted = sorted(self.latencies)
+        return self._sorted[int(fraction * (len(self._sorted) - 1))]
+
+
+class RoutingPaymentStrategy(PaymentStrategy):
+    """
+    Wraps several strategies and sends each payment to the healthiest one.
+
+    Each strategy's latency and failures are tracked over its last
+    `window` payments. Strategies with fewer than `min_samples` payments
+    are tried first. After that, strategies whose error rate is above
+    `max_error_rate` are skipped (unless all of them are), and the one with
+    the lowest `percentile` latency wins. With policy="epsilon_greedy",
+    an `epsilon` share of payments goes to a random eligible strategy so
+    that a rail that has sped up gets noticed; "least_latency" never
+    explores.
+
+    Under either policy, a skipped strategy gets one probe payment once
+    `probe_interval` seconds have passed since it was last used. If the
+    probe succeeds its window is cleared, so it is tried afresh like a
+    new strategy and a rail that has recovered gets back into rotation.
+    """
+
+    POLICIES = ("least_latency", "epsilon_greedy")
+
+    def __init__(
+        self,
+        strategies: list[PaymentStrategy],
+        policy: str = "epsilon_greedy",
+        window: int = 100,
+        percentile: float = 0.95,
+        max_error_rate: float = 0.2,
+        min_samples: int = 5,
+        epsilon: float = 0.05,
+        probe_interval: float = 1.0,
+        clock=time.perf_counter,
+        rng: random.Random | None = None,
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"unknown routing policy {policy!r}")
+        self._strategies = list(strategies)
+        self._stats = {id(strategy): RailStats(window) for strategy in self._strategies}
+        self._policy = policy
+        self._percentile = percentile
+        self._max_error_rate = max_error_rate
+        self._min_samples = min_samples
+        self._epsilon = epsilon
+        self._probe_interval = probe_interval
+        self._clock = clock
+        self._rng = rng or random.Random()
+
+    def stats(self, strategy: PaymentStrategy) -> RailStats:
+        return self._stats[id(strategy)]
+
+    def choose(self) -> PaymentStrategy:
+        for strategy in self._strategies:
+            if self._stats[id(strategy)].samples < self._min_samples:
+                return strategy
+
+        now = self._clock()
+        eligible = []
+        for strategy in self._strategies:
+            stats = self._stats[id(strategy)]
+            if stats.error_rate <= self._max_error_rate:
+                eligible.append(strategy)
+            elif now - stats.last_used >= self._probe_interval:
+                return strategy
+        eligible = eligible or self._strategies
+        if self._policy == "epsilon_greedy" and self._rng.random() < self._epsilon:
+            return self._rng.choice(eligible)
+        return min(eligible, key=lambda strategy: self._stats[id(strategy)].percentile(self._percentile))
+
+    def pay(self, amount: float) -> None:
+        strategy = self.choose()
+        stats = self._stats[id(strategy)]
+        probing = stats.samples >= self._min_samples and stats.error_rate > self._max_error_rate
+        start = stats.last_used = self._clock()
+        try:
+            strategy.pay(amount)
+        except Exception:
+            stats.record(self._clock() - start, failed=True)
+            raise
+        if probing:
+            # The rail looks healthy again: forget the failures that excluded it
+            stats.reset()
+        stats.record(self._clock() - start, failed=False)
+
+
 # -----------------------------
 # Context
 # -----------------------------
@@ -44,6 +214,122 @@ class Checkout:
     def complete_payment(self, amount: float) -> None:
         self._strategy.pay(amount)
 
+    def complete_payments(
+        self, items: list[tuple[PaymentStrategy, Decimal | int | float | str] | Decimal | int | float | str]
+    ) -> list[PaymentResult]:
+        """
+        Pay many amounts at once. Each item is (strategy, amount), or a bare
+        amount for the current strategy. Items are grouped by strategy and
+        each group goes through one pay_batch() call; results come back in
+        the same order as `items`.
+        """
+        groups: dict[int, tuple[PaymentStrategy, list[int], list[Decimal]]] = {}
+        for position, item in enumerate(items):
+            strategy, amount = item if isinstance(item, tuple) else (self._strategy, item)
+            group = groups.get(id(strategy))
+            if group is None:
+                group = groups[id(strategy)] = (strategy, [], [])
+            group[1].append(position)
+            group[2].append(to_decimal(amount))
+
+        results: list[PaymentResult | None] = [None] * len(items)
+        for strategy, positions, amounts in groups.values():
+            try:
+                group_results = strategy.pay_batch(amounts)
+            except Exception as error:
+                method = type(strategy).__name__
+                group_results = [PaymentResult(amount, method, False, str(error)) for amount in amounts]
+            for position, result in zip(positions, group_results):
+                results[position] = result
+        return results
+
+
+# -----------------------------
+# Simulated Load (Benchmark)
+# -----------------------------
+class VirtualClock:
+    """Simulated time, so the benchmark runs instantly"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class SimulatedRail(PaymentStrategy):
+    """
+    Payment rail whose latency (in simulated seconds) comes from
+    `latency(payment_number, rng)`; it fails with probability `error_rate`.
+    """
+
+    def __init__(self, clock: VirtualClock, latency, error_rate: float = 0.0, rng: random.Random | None = None):
+        self._clock = clock
+        self._latency = latency
+        self._error_rate = error_rate
+        self._rng = rng or random.Random(0)
+        self.calls = 0
+
+    def pay(self, amount: float) -> None:
+        self.calls += 1
+        self._clock.now += self._latency(self.calls, self._rng)
+        if self._rng.random() < self._error_rate:
+            raise RuntimeError("rail declined")
+
+
+def simulate(checkout_strategy_factory, payments: int = 20_000) -> list[float]:
+    """Latency of every payment while the card rail degrades mid-run"""
+    clock = VirtualClock()
+    degraded = range(payments // 4, 3 * payments // 4)
+    load = {"payment": 0}
+
+    def card_latency(_, rng: random.Random) -> float:
+        if load["payment"] in degraded:
+            return rng.lognormvariate(-1.5, 1.0)  # ~220 ms median, long tail
+        return rng.lognormvariate(-4.0, 0.3)      # ~18 ms
+
+    rails = [
+        SimulatedRail(clock, card_latency, rng=random.Random(1)),
+        SimulatedRail(clock, lambda _, rng: rng.lognormvariate(-3.5, 0.4), rng=random.Random(2)),
+        SimulatedRail(clock, lambda _, rng: rng.lognormvariate(-3.2, 0.3), 0.01, random.Random(3)),
+    ]
+    checkout = Checkout(checkout_strategy_factory(rails, clock))
+    latencies = []
+    for payment in range(payments):
+        load["payment"] = payment
+        start = clock()
+        try:
+            checkout.complete_payment(100)
+        except RuntimeError:
+            pass
+        latencies.append(clock() - start)
+    return latencies
+
+
+def benchmark_routing(payments: int = 20_000) -> None:
+    print(f"\n--- {payments} simulated payments, card rail degrades for the middle half ---")
+
+    def report(label: str, latencies: list[float]) -> None:
+        ordered = sorted(latencies)
+        p50, p99 = ordered[len(ordered) // 2], ordered[int(0.99 * (len(ordered) - 1))]
+        print(f"{label:<26} p50 {p50 * 1000:6.1f} ms   p99 {p99 * 1000:7.1f} ms")
+
+    report("fixed CardPayment", simulate(lambda rails, clock: rails[0], payments))
+    for policy in RoutingPaymentStrategy.POLICIES:
+        report(
+            f"routed ({policy})",
+            simulate(
+                lambda rails, clock: RoutingPaymentStrategy(
+                    rails, policy=policy, clock=clock, rng=random.Random(4)
+                ),
+                payments,
+            ),
+        )
+
+
+def benchmark() -> None:
+    benchmark_routing()
+
 
 # -----------------------------
 # Client Code (Runnable Demo)
@@ -63,6 +349,27 @@ def main():
     checkout.set_strategy(WalletPayment())
     checkout.complete_payment(amount)
 
+    # Settle a batch spread across strategies
+    print("\n--- Batch settlement ---")
+    card, upi = CardPayment(), UpiPayment()
+    results = checkout.complete_payments([
+        (card, "199.99"), (upi, 0.1), (card, 300), (upi, 0.2), 75.5,
+    ])
+    for result in results:
+        print(result)
+    total = sum((r.amount for r in results if r.ok), Decimal(0))
+    print(f"Settled ₹{total} across {len(results)} payments")
+
+    # Let the router pick the healthiest rail
+    print("\n--- Adaptive routing ---")
+    router = RoutingPaymentStrategy([card, upi, WalletPayment()], min_samples=1)
+    checkout.set_strategy(router)
+    for _ in range(4):
+        checkout.complete_payment(amount)
+
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        main()
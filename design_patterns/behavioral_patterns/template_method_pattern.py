@@ -1,4 +1,19 @@
+import csv
+import io
+import json
+import mmap
+import os
+import queue
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
 from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
 
 
 # -----------------------------
@@ -29,40 +44,674 @@ class DataImporter(ABC):
         pass
 
 
+# -----------------------------
+# Streaming Template
+# -----------------------------
+_END_OF_STREAM = object()
+
+
+class StreamingDataImporter(ABC):
+    """
+    Same algorithm as DataImporter, but data flows through it in chunks:
+    read_data yields lists of up to `chunk_size` records, and validation
+    and saving consume them one chunk at a time.
+
+    A background thread reads ahead by at most `max_in_flight` chunks,
+    so reading overlaps with saving while memory stays bounded by
+    roughly (max_in_flight + 2) chunks, whatever the input size.
+    max_in_flight=0 reads on the calling thread.
+    """
+
+    def __init__(self, chunk_size: int = 10_000, max_in_flight: int = 2):
+        self.chunk_size = chunk_size
+        self.max_in_flight = max_in_flight
+        self.records_read = 0
+        self.records_saved = 0
+        self.chunks = 0
+
+    def process(self) -> None:
+        """Template Method (fixed algorithm), one chunk at a time"""
+        for chunk in self.validate_data(self._read_ahead(self.read_data())):
+            self.save_data(chunk)
+            self.records_saved += len(chunk)
+            self.chunks += 1
+        self.finish_saving()
+        self.after_save_hook()
+
+    @abstractmethod
+    def read_data(self) -> Iterator[list]:
+        """Yield chunks (lists) of records"""
+        pass
+
+    def validate_data(self, chunks: Iterable[list]) -> Iterator[list]:
+        for chunk in chunks:
+            self.records_read += len(chunk)
+            yield [record for record in chunk if self.is_valid(record)]
+
+    def is_valid(self, record) -> bool:
+        return True
+
+    @abstractmethod
+    def save_data(self, chunk: list) -> None:
+        pass
+
+    def finish_saving(self) -> None:
+        """Optional hook: make saved chunks durable before after_save_hook runs"""
+        pass
+
+    def after_save_hook(self) -> None:
+        """Optional hook"""
+        pass
+
+    def _read_ahead(self, chunks: Iterator[list]) -> Iterator[list]:
+        if self.max_in_flight <= 0:
+            yield from chunks
+            return
+
+        buffer: queue.Queue = queue.Queue(maxsize=self.max_in_flight)
+        stop = threading.Event()
+
+        def offer(item) -> bool:
+            """Put into the buffer unless the consumer has gone away"""
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def reader() -> None:
+            try:
+                for chunk in chunks:
+                    if not offer(chunk):
+                        return
+                offer(_END_OF_STREAM)
+            except BaseException as error:
+                offer(error)
+            finally:
+                # Release read_data's open files and pools now, not at garbage collection
+                chunks.close()
+
+        thread = threading.Thread(target=reader, name="importer-read-ahead", daemon=True)
+        thread.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            # Unblock the reader if the consumer stopped early
+            stop.set()
+            thread.join()
+
+
+def chunked(records: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# -----------------------------
+# Parallel CSV Parsing
+# -----------------------------
+def record_aligned_ranges(path: str, start: int, range_bytes: int) -> Iterator[tuple[int, int]]:
+    """
+    Split a file from `start` into byte ranges of about `range_bytes`,
+    each ending at a record boundary: a newline outside quotes. Every
+    range starts at a boundary, so quotes are balanced at its start and
+    a newline ends a record only when the range has an even number of
+    quote characters before it ("" escapes count twice, so they cancel).
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= start:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            position = start
+            while position < size:
+                end = min(position + range_bytes, size)
+                if end < size:
+                    quotes = mapped[position:end - 1].count(b'"')
+                    scanned = end - 1
+                    while True:
+                        newline = mapped.find(b"\n", scanned)
+                        if newline == -1:
+                            end = size
+                            break
+                        quotes += mapped[scanned:newline].count(b'"')
+                        if quotes % 2 == 0:
+                            end = newline + 1
+                            break
+                        # Newline inside a quoted field: keep looking
+                        scanned = newline + 1
+                yield position, end
+                position = end
+
+
+def parse_csv_range(path: str, start: int, end: int, fieldnames: list[str], is_valid) -> tuple[int, list[dict]]:
+    """Worker: parse and validate one byte range; returns (rows read, valid rows)"""
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        text = mapped[start:end].decode("utf-8")
+    rows = list(csv.DictReader(io.StringIO(text, newline=""), fieldnames=fieldnames))
+    return len(rows), [row for row in rows if is_valid(row)]
+
+
+# -----------------------------
+# Incremental JSON Parsing
+# -----------------------------
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_DELIMITERS = _JSON_WHITESPACE + ",]"
+
+
+# Longest token that can fail to decode when cut short: "-Infinity", or a \uXXXX escape
+_JSON_TOKEN_TAIL = 9
+
+
+def _cut_off(error: json.JSONDecodeError, buffer: str) -> bool:
+    """Whether a decode error could be the buffer edge rather than bad input"""
+    if error.msg.startswith("Unterminated string"):
+        # A string only goes unterminated by running into the end of the buffer
+        return True
+    return error.pos >= len(buffer) - _JSON_TOKEN_TAIL
+
+
+def iter_json_array(f, buffer_size: int = 1024 * 1024) -> Iterator:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Reads `buffer_size` characters at a time and decodes each element with
+    JSONDecoder.raw_decode, so memory is bounded by the buffer plus the
+    largest single element, not by the file size.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        data = f.read(buffer_size)
+        if not data:
+            eof = True
+            return False
+        buffer = buffer[pos:] + data
+        pos = 0
+        return True
+
+    def skip_whitespace() -> bool:
+        """Advance past whitespace; False once the input is exhausted"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return pos < len(buffer)
+
+    if not skip_whitespace() or buffer[pos] != "[":
+        raise ValueError("Expected a top-level JSON array")
+    pos += 1
+
+    expect_element, after_comma = True, False
+    while True:
+        if not skip_whitespace():
+            raise ValueError("Unterminated JSON array")
+        char = buffer[pos]
+        if char == "]" and not (expect_element and after_comma):
+            return
+        if not expect_element:
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' but found {char!r}")
+            pos += 1
+            expect_element = after_comma = True
+            continue
+
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as error:
+                # Only an element cut off by the end of the buffer is worth reading on for
+                if _cut_off(error, buffer) and fill():
+                    continue
+                raise
+            # A number cut off by the buffer edge ("1" of "1.5") still decodes,
+            # so only accept an element once its delimiter is in the buffer
+            if end < len(buffer) and buffer[end] in _JSON_DELIMITERS:
+                break
+            if not fill():
+                break
+        pos = end
+        expect_element = False
+        yield element
+
+
+# -----------------------------
+# SQLite Save Stage
+# -----------------------------
+class SQLiteWriter:
+    """
+    Save stage for importers: writes record dicts into a SQLite table.
+
+    mode="bulk" inserts each chunk with executemany and commits every
+    `commit_every` rows in one transaction; mode="row" inserts and commits
+    one record at a time. With drop_indexes=True the table's indexes are
+    dropped on open and rebuilt on close, which is faster for large loads
+    than maintaining them row by row.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: str,
+        columns: list[str],
+        mode: str = "bulk",
+        commit_every: int = 50_000,
+        synchronous: str = "NORMAL",
+        drop_indexes: bool = False,
+    ):
+        if mode not in ("bulk", "row"):
+            raise ValueError(f"Unknown mode {mode!r}")
+        self.path = path
+        self.table = table
+        self.columns = list(columns)
+        self.mode = mode
+        self.commit_every = commit_every
+        self.synchronous = synchronous
+        self.drop_indexes = drop_indexes
+        self.rows_written = 0
+        self.commits = 0
+        self._pending = 0
+        self._dropped_indexes: list[str] = []
+        self._conn: sqlite3.Connection | None = None
+        placeholders = ", ".join("?" for _ in self.columns)
+        names = ", ".join(f'"{column}"' for column in self.columns)
+        self._insert = f'INSERT INTO "{table}" ({names}) VALUES ({placeholders})'
+
+    def open(self) -> None:
+        # Autocommit mode, so transactions are only the ones begun below
+        self._conn = sqlite3.connect(self.path, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        names = ", ".join(f'"{column}"' for column in self.columns)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({names})')
+        if self.drop_indexes:
+            rows = self._conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (self.table,),
+            ).fetchall()
+            for name, sql in rows:
+                self._conn.execute(f'DROP INDEX "{name}"')
+                self._dropped_indexes.append(sql)
+
+    def write(self, records: list[dict]) -> None:
+        if self._conn is None:
+            self.open()
+        rows = [tuple(record.get(column) for column in self.columns) for record in records]
+        try:
+            if self.mode == "row":
+                for row in rows:
+                    self._conn.execute("BEGIN")
+                    self._conn.execute(self._insert, row)
+                    self._conn.execute("COMMIT")
+                    self.commits += 1
+                    self.rows_written += 1
+            else:
+                if not self._conn.in_transaction:
+                    self._conn.execute("BEGIN")
+                self._conn.executemany(self._insert, rows)
+                self._pending += len(rows)
+                self.rows_written += len(rows)
+                if self._pending >= self.commit_every:
+                    self._commit()
+        except sqlite3.Error:
+            self._rollback()
+            raise
+
+    def close(self, commit: bool = True) -> None:
+        """
+        Commit (or, with commit=False, roll back) the open transaction,
+        then rebuild any dropped indexes either way
+        """
+        if self._conn is None:
+            return
+        try:
+            if commit and self._conn.in_transaction:
+                self._commit()
+            else:
+                self._rollback()
+            for sql in self._dropped_indexes:
+                self._conn.execute(sql)
+            self._dropped_indexes.clear()
+        finally:
+            self._conn.close()
+            self._conn = None
+
+    def _commit(self) -> None:
+        self._conn.execute("COMMIT")
+        self.commits += 1
+        self._pending = 0
+
+    def _rollback(self) -> None:
+        if self._conn.in_transaction:
+            self._conn.execute("ROLLBACK")
+        # Those rows were never committed
+        self.rows_written -= self._pending
+        self._pending = 0
+
+
 # -----------------------------
 # Concrete Implementations
 # -----------------------------
-class CSVImporter(DataImporter):
-    def read_data(self) -> None:
-        print("📄 Reading CSV file")
+class CSVImporter(StreamingDataImporter):
+    """
+    With workers > 1, the file is split into record-aligned byte ranges
+    of about `range_bytes` (located via mmap, never reading the whole
+    file), and each range is parsed and validated in a process pool.
+    Results come back in file order, at most 2 * workers ranges at a time.
+    """
 
-    def save_data(self) -> None:
-        print("💾 Saving CSV data to database")
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = 10_000,
+        max_in_flight: int = 2,
+        workers: int = 1,
+        range_bytes: int = 8 * 1024 * 1024,
+    ):
+        super().__init__(chunk_size, max_in_flight)
+        self.path = path
+        self.workers = workers
+        self.range_bytes = range_bytes
+
+    def read_data(self) -> Iterator:
+        print(f"📄 Reading CSV file {os.path.basename(self.path)}")
+        if self.workers > 1:
+            yield from self._read_parallel()
+            return
+        with open(self.path, newline="", encoding="utf-8") as f:
+            yield from chunked(csv.DictReader(f), self.chunk_size)
+
+    def _read_parallel(self) -> Iterator[tuple[int, list[dict]]]:
+        with open(self.path, "rb") as f:
+            header = f.readline()
+        fieldnames = next(csv.reader([header.decode("utf-8")]))
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for start, end in record_aligned_ranges(self.path, len(header), self.range_bytes):
+                pending.append(pool.submit(parse_csv_range, self.path, start, end, fieldnames, self.is_valid))
+                if len(pending) >= 2 * self.workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def validate_data(self, chunks: Iterable) -> Iterator[list[dict]]:
+        if self.workers <= 1:
+            yield from super().validate_data(chunks)
+            return
+        # Workers already validated each range
+        for rows_read, valid in chunks:
+            self.records_read += rows_read
+            yield valid
+
+    @staticmethod
+    def is_valid(record: dict) -> bool:
+        # Static so worker processes get it by reference, not a pickled importer.
+        # Short rows come back with None for the missing columns
+        return all(value not in (None, "") for value in record.values())
+
+    def save_data(self, chunk: list[dict]) -> None:
+        print(f"💾 Saving {len(chunk)} CSV rows to database")
 
     def after_save_hook(self) -> None:
         print("📧 Sending CSV import email")
 
 
-class JSONImporter(DataImporter):
-    def read_data(self) -> None:
-        print("📄 Reading JSON file")
+class JSONImporter(StreamingDataImporter):
+    """Expects a single top-level array; elements are parsed incrementally"""
 
-    def save_data(self) -> None:
-        print("💾 Saving JSON data to database")
+    def __init__(
+        self,
+        path: str,
+        chunk_size: int = 10_000,
+        max_in_flight: int = 2,
+        buffer_size: int = 1024 * 1024,
+    ):
+        super().__init__(chunk_size, max_in_flight)
+        self.path = path
+        self.buffer_size = buffer_size
+
+    def read_data(self) -> Iterator[list]:
+        print(f"📄 Reading JSON file {os.path.basename(self.path)}")
+        with open(self.path, encoding="utf-8") as f:
+            yield from chunked(iter_json_array(f, self.buffer_size), self.chunk_size)
+
+    def is_valid(self, record) -> bool:
+        return isinstance(record, dict)
+
+    def save_data(self, chunk: list[dict]) -> None:
+        print(f"💾 Saving {len(chunk)} JSON records to database")
+
+
+class SQLiteCSVImporter(CSVImporter):
+    """CSVImporter whose save step writes to SQLite through a SQLiteWriter"""
+
+    def __init__(self, path: str, writer: SQLiteWriter, chunk_size: int = 10_000, max_in_flight: int = 2):
+        super().__init__(path, chunk_size, max_in_flight)
+        self.writer = writer
+
+    def process(self) -> None:
+        try:
+            super().process()
+        except BaseException:
+            # Roll back the open batch; only earlier commit_every batches stay committed.
+            # A no-op if finish_saving already closed the writer.
+            self.writer.close(commit=False)
+            raise
+
+    def save_data(self, chunk: list[dict]) -> None:
+        self.writer.write(chunk)
+
+    def finish_saving(self) -> None:
+        # Commits the last partial batch and rebuilds any dropped indexes
+        self.writer.close()
+
+    def after_save_hook(self) -> None:
+        print(f"🗄️ Wrote {self.writer.rows_written} rows to {self.writer.table} in {self.writer.commits} commit(s)")
+
+
+# -----------------------------
+# Benchmarks
+# -----------------------------
+class CountingCSVImporter(CSVImporter):
+    """Importer that skips the database write, to measure the pipeline alone"""
+
+    def save_data(self, chunk: list[dict]) -> None:
+        pass
+
+    def after_save_hook(self) -> None:
+        pass
+
+
+class CountingJSONImporter(JSONImporter):
+    def save_data(self, chunk: list[dict]) -> None:
+        pass
+
+
+def write_sample_json(path: str, rows: int) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[\n")
+        for i in range(rows):
+            if i:
+                f.write(",\n")
+            json.dump({"id": i, "name": f"user{i}", "total": i % 1000, "tags": ["a", "b"]}, f)
+        f.write("\n]\n")
+
+
+def write_sample_csv(path: str, rows: int) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "name", "email", "amount"])
+        for i in range(rows):
+            writer.writerow([i, f"user{i}", f"user{i}@example.com", f"{i % 1000}.{i % 100:02d}"])
+
+
+def benchmark_streaming_memory(row_counts=(100_000, 400_000), chunk_size: int = 5_000) -> None:
+    print(f"\n--- Peak memory while streaming CSV, chunk_size={chunk_size} ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            path = os.path.join(tmp, f"{rows}.csv")
+            write_sample_csv(path, rows)
+            importer = CountingCSVImporter(path, chunk_size=chunk_size)
+            tracemalloc.start()
+            importer.process()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(
+                f"{os.path.getsize(path) / 1e6:6.1f} MB file, {importer.records_saved} rows: "
+                f"peak {peak / 1e6:5.1f} MB"
+            )
+
+
+def benchmark_parallel_csv(rows: int = 1_000_000, range_bytes: int = 4 * 1024 * 1024) -> None:
+    cores = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, cores})
+    print(f"\n--- Parallel CSV parsing, {rows} rows, {cores} cores available ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.csv")
+        write_sample_csv(path, rows)
+        size_mb = os.path.getsize(path) / 1e6
+        baseline = None
+        for workers in worker_counts:
+            importer = CountingCSVImporter(path, workers=workers, range_bytes=range_bytes)
+            start = time.perf_counter()
+            importer.process()
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            print(
+                f"{workers} worker(s): {size_mb / elapsed:6.1f} MB/s, "
+                f"{importer.records_saved} rows ({baseline / elapsed:.2f}x)"
+            )
+
+
+def benchmark_incremental_json(row_counts=(100_000, 400_000)) -> None:
+    print("\n--- JSON import: json.load vs incremental reader ---")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in row_counts:
+            path = os.path.join(tmp, f"{rows}.json")
+            write_sample_json(path, rows)
+            size_mb = os.path.getsize(path) / 1e6
+
+            def load_all() -> None:
+                with open(path, encoding="utf-8") as f:
+                    for _ in chunked(json.load(f), 10_000):
+                        pass
+
+            def stream() -> None:
+                CountingJSONImporter(path).process()
+
+            for label, run in (("json.load", load_all), ("incremental", stream)):
+                start = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - start
+                tracemalloc.start()
+                run()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(
+                    f"{size_mb:6.1f} MB file, {label:<11}: {size_mb / elapsed:6.1f} MB/s, "
+                    f"peak {peak / 1e6:6.1f} MB"
+                )
+
+
+class QuietSQLiteCSVImporter(SQLiteCSVImporter):
+    def after_save_hook(self) -> None:
+        pass
+
+
+def benchmark_sqlite_save(rows: int = 200_000, row_mode_rows: int = 20_000) -> None:
+    print("\n--- SQLite save: row-at-a-time vs bulk ---")
+    columns = ["id", "name", "email", "amount"]
+    cases = (
+        ("row-at-a-time", row_mode_rows, dict(mode="row")),
+        ("bulk", rows, dict(mode="bulk")),
+        ("bulk, drop indexes", rows, dict(mode="bulk", drop_indexes=True)),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, count, options in cases:
+            csv_path = os.path.join(tmp, f"{count}.csv")
+            if not os.path.exists(csv_path):
+                write_sample_csv(csv_path, count)
+            db_path = os.path.join(tmp, f"{label}.db")
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("CREATE TABLE customers (id, name, email, amount)")
+                conn.execute("CREATE INDEX customers_email ON customers (email)")
+                conn.execute("CREATE INDEX customers_name ON customers (name)")
+            conn.close()
+
+            writer = SQLiteWriter(db_path, "customers", columns, **options)
+            importer = QuietSQLiteCSVImporter(csv_path, writer)
+            start = time.perf_counter()
+            importer.process()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<19}: {count / elapsed:10,.0f} rows/s ({count} rows, {writer.commits} commits)")
+
+
+def benchmark() -> None:
+    benchmark_streaming_memory()
+    benchmark_parallel_csv()
+    benchmark_incremental_json()
+    benchmark_sqlite_save()
 
 
 # -----------------------------
 # Client Code
 # -----------------------------
 def main():
-    print("\n--- CSV Import ---")
-    csv_importer = CSVImporter()
-    csv_importer.process()
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "customers.csv")
+        with open(csv_path, "w", encoding="utf-8") as f:
+            f.write("id,name,email\n1,Asha,asha@example.com\n2,Ravi,\n3,Meera,meera@example.com\n")
+
+        json_path = os.path.join(tmp, "orders.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump([{"id": 1, "total": 250}, {"id": 2, "total": 99}, "corrupt", {"id": 3, "total": 10}], f)
+
+        print("\n--- CSV Import ---")
+        csv_importer = CSVImporter(csv_path, chunk_size=2)
+        csv_importer.process()
+        print(f"✅ Validated {csv_importer.records_read} rows, kept {csv_importer.records_saved}")
+
+        print("\n--- CSV Import, 2 worker processes ---")
+        parallel_importer = CSVImporter(csv_path, workers=2, range_bytes=32)
+        parallel_importer.process()
+        print(f"✅ Validated {parallel_importer.records_read} rows, kept {parallel_importer.records_saved}")
+
+        print("\n--- JSON Import ---")
+        json_importer = JSONImporter(json_path, chunk_size=2)
+        json_importer.process()
+        print(f"✅ Validated {json_importer.records_read} records, kept {json_importer.records_saved}")
 
-    print("\n--- JSON Import ---")
-    json_importer = JSONImporter()
-    json_importer.process()
+        print("\n--- CSV Import into SQLite ---")
+        db_path = os.path.join(tmp, "customers.db")
+        writer = SQLiteWriter(db_path, "customers", ["id", "name", "email"], commit_every=2)
+        SQLiteCSVImporter(csv_path, writer, chunk_size=2).process()
+        with sqlite3.connect(db_path) as conn:
+            for row in conn.execute("SELECT id, name, email FROM customers ORDER BY id"):
+                print(f"   {row}")
+        conn.close()
 
 
 if __name__ == "__main__":
-    main()
+    if "--bench" in sys.argv:
+        benchmark()
+    else:
+        main()